@@ -12,15 +12,43 @@ Endpoints:
     POST /api/decode          - Extract hidden message
     GET  /api/algorithms      - List available algorithms
     POST /api/analyze         - Analyze image quality metrics
+
+Images are sent as base64 strings in JSON, or as file uploads in a
+multipart/form-data body (see get_request_data).
 """
 
-from flask import Flask, request, jsonify, send_file, send_from_directory
+from flask import Flask, Request, Response, request, jsonify, send_file, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.datastructures import FileStorage
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
 import base64
+import binascii
+import hashlib
 import io
 import os
-import tempfile
-from typing import Dict, Any
+from typing import Dict, Any, Union
+
+# orjson is optional but recommended: it serializes responses much faster
+# (base64 images can be MBs) and writes bytes directly, with no str step
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pybase64 is optional: SIMD base64 that decodes image payloads several
+# times faster than binascii (same lenient rules, same binascii.Error)
+try:
+    import pybase64
+    b64decode, b64encode = pybase64.b64decode, pybase64.b64encode
+except ImportError:
+    b64decode, b64encode = binascii.a2b_base64, base64.b64encode
+
+# Flask-Compress is optional: gzip/brotli for JSON responses
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
 
 # Import our steganography modules
 import text_stego
@@ -28,11 +56,182 @@ import image_stego
 import security
 import metrics
 
-app = Flask(__name__, static_folder='static')
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+# Largest upload (and decoded image) we accept
+MAX_IMAGE_SIZE_BYTES = 16 * 1024 * 1024  # 16MB
+
+# A data URL prefix ("data:image/png;base64,") is always shorter than this
+DATA_URL_PREFIX_MAX_LENGTH = 64
+
+# Browsers may reuse the frontend page for an hour before revalidating
+STATIC_MAX_AGE = 3600
+
+
+class InMemoryRequest(Request):
+    """Request that keeps multipart file uploads in memory.
+
+    Werkzeug spools uploads over 500KB to a temporary file; the body is
+    already capped by MAX_CONTENT_LENGTH, so a BytesIO is always safe.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type,
+                         filename=None, content_length=None):
+        return io.BytesIO()
+
 
-# Enable CORS for all routes
-CORS(app)
+app = Flask(__name__, static_folder='static')
+app.request_class = InMemoryRequest
+app.config['MAX_CONTENT_LENGTH'] = MAX_IMAGE_SIZE_BYTES  # 16MB max file size
+
+# Behind Nginx/Apache, let the front server send static files with sendfile(2)
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE') == '1'
+
+# Enable CORS for all routes (let browsers read the binary encode metadata).
+# Browsers send a preflight OPTIONS before every cross-origin JSON POST;
+# max_age lets them cache the answer for a day
+CORS(app, max_age=86400, expose_headers=[
+    'X-Stego-Algorithm', 'X-Stego-Encrypted', 'X-Stego-Bits-Per-Pixel',
+    'X-Stego-Channel', 'X-Stego-Pixels-Modified',
+    'X-Stego-Capacity-Used-Percent', 'X-Stego-Message-Length'
+])
+
+# Compress JSON responses (base64 stego images shrink by about 25%).
+# Brotli at level 4 is cheap; tiny bodies like /ping are not worth it
+if Compress is not None:
+    app.config.update(
+        COMPRESS_ALGORITHM=['br', 'gzip'],
+        COMPRESS_LEVEL=4,
+        COMPRESS_BR_LEVEL=4,
+        COMPRESS_MIN_SIZE=500,
+        COMPRESS_MIMETYPES=['application/json']
+    )
+    Compress(app)
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider that parses and serializes with orjson."""
+
+    def _dumps_bytes(self, obj) -> bytes:
+        # Like the stdlib encoder, accept non-str dict keys (e.g. ints)
+        return orjson.dumps(obj, default=self.default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+    def dumps(self, obj, **kwargs):
+        return self._dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        # Write orjson's bytes straight into the response (no str round trip)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps_bytes(obj), mimetype=self.mimetype)
+
+
+# Requests and responses carry whole base64 images: use orjson for both
+# (jsonify() goes through app.json.response)
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+
+
+def dumps_compact(obj) -> bytes:
+    """Serialize obj to the exact bytes jsonify() would send."""
+    return app.json.response(obj).get_data()
+
+
+# Accepted request parameter values (tuples: membership also works for
+# unhashable JSON values such as lists, which are simply rejected)
+VALID_ENCODING_BITS = (1, 2)
+VALID_INSERTION_METHODS = ('append', 'between_words', 'distributed')
+VALID_BITS_PER_PIXEL = (1, 2, 3)
+VALID_CHANNELS = (0, 1, 2)
+CHANNEL_NAMES = ('red', 'green', 'blue')
+VALID_OUTPUT_FORMATS = ('png', 'bmp', 'tiff', 'webp')
+VALID_COMPRESS_LEVELS = tuple(range(10))
+
+# Available algorithms (served by /api/algorithms)
+ALGORITHMS = {
+    'text': [
+        {
+            'id': 'zwc',
+            'name': 'Zero-Width Characters (ZWC)',
+            'description': 'Hide messages using invisible Unicode characters',
+            'encoding_bits': VALID_ENCODING_BITS,
+            'insertion_methods': VALID_INSERTION_METHODS,
+            'supports_encryption': True
+        }
+    ],
+    'image': [
+        {
+            'id': 'lsb',
+            'name': 'Least Significant Bit (LSB)',
+            'description': 'Hide messages in the least significant bits of image pixels',
+            'bits_per_pixel': VALID_BITS_PER_PIXEL,
+            'channels': ['blue', 'green', 'red'],
+            'supports_encryption': True,
+            'quality_metrics': ['MSE', 'PSNR', 'SSIM']
+        }
+    ]
+}
+
+# /api/algorithms is constant, so serialize it and compute its ETag once
+ALGORITHMS_JSON = dumps_compact({
+    'success': True,
+    'algorithms': ALGORITHMS,
+    'total_count': len(ALGORITHMS['text']) + len(ALGORITHMS['image'])
+})
+ALGORITHMS_ETAG = hashlib.blake2b(ALGORITHMS_JSON, digest_size=16).hexdigest()
+ALGORITHMS_HEADERS = {
+    'ETag': f'"{ALGORITHMS_ETAG}"',
+    'Cache-Control': 'public, max-age=3600'
+}
+
+# Operation names used in 500 error messages ("Encoding failed: ...")
+ENDPOINT_OPERATIONS = {
+    'encode_message': 'Encoding',
+    'decode_message': 'Decoding',
+    'analyze_image': 'Analysis'
+}
+
+# MIME types for the stego image formats we can produce
+IMAGE_MIMETYPES = {'PNG': 'image/png', 'BMP': 'image/bmp', 'TIFF': 'image/tiff',
+                   'WEBP': 'image/webp'}
+
+# The health check payload never changes, so serialize it once at import
+PING_JSON = dumps_compact({
+    'status': 'ok',
+    'message': 'Steganography API is running',
+    'version': '1.0.0'
+})
+
+# Request validation errors have fixed messages, so their JSON bodies are
+# serialized once here. Messages with dynamic parts are not cached
+VALIDATION_ERRORS = (
+    "No JSON data provided",
+    "'secret_message' is required",
+    "'cover_text' is required for text steganography",
+    "'encoding_bits' must be 1 or 2",
+    "Invalid insertion_method",
+    "'cover_image' (base64) is required for image steganography",
+    "'bits_per_pixel' must be 1, 2, or 3",
+    "'channel' must be 0 (red), 1 (green), or 2 (blue)",
+    "'output_format' must be 'png', 'bmp', 'tiff', or 'webp'",
+    "'compress_level' must be an integer from 0 to 9",
+    "'stego_text' is required",
+    "'stego_image' (base64) is required",
+    "Both 'original_image' and 'stego_image' are required"
+)
+
+# Fixed messages of the 404/413/500 error handlers, cached the same way
+HANDLER_ERRORS = (
+    "Endpoint not found",
+    "File too large (max 16MB)",
+    "Internal server error"
+)
+
+ERROR_BODIES = {
+    message: dumps_compact({'error': message, 'success': False})
+    for message in VALIDATION_ERRORS + HANDLER_ERRORS
+}
 
 
 # ============================================================================
@@ -41,6 +240,9 @@ CORS(app)
 
 def error_response(message: str, status_code: int = 400) -> tuple:
     """Create standardized error response."""
+    body = ERROR_BODIES.get(message)
+    if body is not None:
+        return Response(body, mimetype='application/json'), status_code
     return jsonify({'error': message, 'success': False}), status_code
 
 
@@ -52,22 +254,94 @@ def success_response(data: Dict[str, Any], message: str = None) -> tuple:
     return jsonify(response), 200
 
 
-def decode_base64_image(base64_string: str) -> bytes:
-    """Decode base64-encoded image data."""
+def get_request_data() -> Dict[str, Any]:
+    """
+    Parse the request parameters as a dict.
+
+    JSON bodies are parsed with app.json (orjson when installed) and not
+    cached on the request, so a multi-MB base64 payload is not kept twice.
+    multipart/form-data bodies take the parameters as a JSON object in the
+    'meta' field, and each uploaded file becomes the FileStorage under its
+    field name (e.g. 'cover_image'), so images skip base64 entirely.
+
+    Raises:
+        ValueError: If the body (or 'meta') is JSON but not an object
+    """
+    if request.mimetype == 'multipart/form-data':
+        meta = request.form.get('meta')
+        data = app.json.loads(meta) if meta else {}
+        if isinstance(data, dict):
+            data.update(request.files.items())
+    else:
+        data = request.get_json(cache=False)
+
+    if data is not None and not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object")
+    return data
+
+
+def decode_base64_image(base64_string: Union[str, bytes]) -> bytes:
+    """
+    Decode base64-encoded image data.
+
+    Accepts a str (from JSON) or bytes. The decoded size is known from the
+    length alone and the image type from the first few bytes, so oversized
+    payloads and non-images are rejected before the full decode, which
+    then runs in a single pass (pybase64 if installed, else binascii).
+
+    Raises:
+        RequestEntityTooLarge: If the image would exceed 16MB (answered with 413)
+        ValueError: If the data is not a base64-encoded supported image
+    """
+    if isinstance(base64_string, str):
+        separator = ','
+    elif isinstance(base64_string, (bytes, bytearray)):
+        separator = b','
+    else:
+        raise ValueError("Invalid base64 image data: expected a string")
+
+    # Remove data URL prefix if present (it can only be at the very start)
+    comma = base64_string.find(separator, 0, DATA_URL_PREFIX_MAX_LENGTH)
+    if comma != -1:
+        if separator == b',':
+            # Slice a view so bytes input is not copied
+            base64_string = memoryview(base64_string)
+        base64_string = base64_string[comma + 1:]
+
+    # Every 4 base64 characters decode to 3 bytes; answer like an oversized body
+    if len(base64_string) * 3 // 4 > MAX_IMAGE_SIZE_BYTES:
+        raise RequestEntityTooLarge()
+
+    # Reject non-images from their magic number before decoding everything
+    # (the first 16 characters decode to 12 bytes; if they don't decode
+    # cleanly, the full decode below reports the error)
+    try:
+        head = b64decode(base64_string[:16])
+    except (binascii.Error, ValueError):
+        head = b''
+    if len(head) == 12 and image_stego.detect_image_format(head) is None:
+        raise ValueError("Unsupported image type (expected PNG, BMP, TIFF or WebP)")
+
     try:
-        # Remove data URL prefix if present
-        if ',' in base64_string:
-            base64_string = base64_string.split(',', 1)[1]
-        return base64.b64decode(base64_string)
-    except Exception as e:
+        return b64decode(base64_string)
+    except (binascii.Error, ValueError) as e:
         raise ValueError(f"Invalid base64 image data: {e}")
 
 
-def encode_image_to_base64(image_path: str) -> str:
-    """Encode image file to base64 string."""
-    with open(image_path, 'rb') as f:
-        image_data = f.read()
-    return base64.b64encode(image_data).decode('ascii')
+def read_image(image: Union[str, bytes, FileStorage]) -> bytes:
+    """
+    Return the raw bytes of an image parameter.
+
+    Uploaded files are checked for a supported magic number and returned
+    as-is; anything else is treated as base64 (see decode_base64_image).
+    """
+    if isinstance(image, FileStorage):
+        # InMemoryRequest keeps uploads in a BytesIO: take its buffer, no copy
+        image_data = image.stream.getvalue()
+        if image_stego.detect_image_format(image_data) is None:
+            raise ValueError("Unsupported image type (expected PNG, BMP, TIFF or WebP)")
+        return image_data
+    return decode_base64_image(image)
 
 
 # ============================================================================
@@ -77,7 +351,7 @@ def encode_image_to_base64(image_path: str) -> str:
 @app.route('/')
 def index():
     """Serve the frontend application."""
-    return send_from_directory('static', 'index.html')
+    return send_from_directory('static', 'index.html', max_age=STATIC_MAX_AGE)
 
 
 @app.route('/ping', methods=['GET'])
@@ -92,11 +366,9 @@ def ping():
         GET /ping
         Response: {"status": "ok", "message": "Steganography API is running"}
     """
-    return jsonify({
-        'status': 'ok',
-        'message': 'Steganography API is running',
-        'version': '1.0.0'
-    })
+    # Short max-age lets proxies and load balancers absorb repeated checks
+    return Response(PING_JSON, mimetype='application/json',
+                    headers={'Cache-Control': 'public, max-age=5'})
 
 
 # ============================================================================
@@ -120,34 +392,12 @@ def get_algorithms():
             }
         }
     """
-    algorithms = {
-        'text': [
-            {
-                'id': 'zwc',
-                'name': 'Zero-Width Characters (ZWC)',
-                'description': 'Hide messages using invisible Unicode characters',
-                'encoding_bits': [1, 2],
-                'insertion_methods': ['append', 'between_words', 'distributed'],
-                'supports_encryption': True
-            }
-        ],
-        'image': [
-            {
-                'id': 'lsb',
-                'name': 'Least Significant Bit (LSB)',
-                'description': 'Hide messages in the least significant bits of image pixels',
-                'bits_per_pixel': [1, 2, 3],
-                'channels': ['blue', 'green', 'red'],
-                'supports_encryption': True,
-                'quality_metrics': ['MSE', 'PSNR', 'SSIM']
-            }
-        ]
-    }
+    # The list never changes: answer revalidations with 304 Not Modified
+    if request.if_none_match.contains(ALGORITHMS_ETAG):
+        return Response(status=304, headers=ALGORITHMS_HEADERS)
 
-    return success_response({
-        'algorithms': algorithms,
-        'total_count': len(algorithms['text']) + len(algorithms['image'])
-    })
+    return Response(ALGORITHMS_JSON, mimetype='application/json',
+                    headers=ALGORITHMS_HEADERS)
 
 
 # ============================================================================
@@ -176,11 +426,24 @@ def encode_message():
             "secret_message": "Hidden message",
             "password": "optional_password",
             "bits_per_pixel": 2,  // optional (1, 2, or 3)
-            "channel": 2  // optional (0=red, 1=green, 2=blue)
+            "channel": 2,  // optional (0=red, 1=green, 2=blue)
+            "output_format": "webp",  // optional (png, bmp, tiff, webp;
+                                      // default: same as the cover image)
+            "compress_level": 1  // optional, PNG only (0-9, default 1)
         }
 
+    Query parameters:
+        format=binary  (image only) Return the stego image file itself
+                       instead of JSON with a base64 string
+
+    Content negotiation (image only):
+        A request whose Accept header prefers the image type (e.g.
+        "Accept: image/png") also gets the raw image file. The encoding
+        statistics are then sent as X-Stego-* response headers.
+
     Returns:
         JSON: Encoded result with stego text/image
+        (or the stego image file itself, see above)
 
     Example:
         POST /api/encode
@@ -190,129 +453,153 @@ def encode_message():
             "secret_message": "Secret!"
         }
     """
-    try:
-        data = request.get_json()
-
-        if not data:
-            return error_response("No JSON data provided")
-
-        algorithm = data.get('algorithm', '').lower()
-        secret_message = data.get('secret_message')
-        password = data.get('password')
-
-        if not secret_message:
-            return error_response("'secret_message' is required")
-
-        # TEXT STEGANOGRAPHY (ZWC)
-        if algorithm == 'zwc':
-            cover_text = data.get('cover_text')
-            if not cover_text:
-                return error_response("'cover_text' is required for text steganography")
-
-            encoding_bits = data.get('encoding_bits', 2)
-            insertion_method = data.get('insertion_method', 'between_words')
-
-            # Validate parameters
-            if encoding_bits not in [1, 2]:
-                return error_response("'encoding_bits' must be 1 or 2")
-
-            if insertion_method not in ['append', 'between_words', 'distributed']:
-                return error_response("Invalid insertion_method")
-
-            # Encrypt if password provided
-            message_to_hide = secret_message
-            if password:
-                message_to_hide = security.encrypt_message(secret_message, password)
-
-            # Encode message
-            stego_text = text_stego.encode_message(
-                cover_text=cover_text,
-                secret_message=message_to_hide,
-                encoding_bits=encoding_bits,
-                insertion_method=insertion_method
+    data = get_request_data()
+
+    if not data:
+        return error_response("No JSON data provided")
+
+    algorithm = data.get('algorithm', '').lower()
+    secret_message = data.get('secret_message')
+    password = data.get('password')
+
+    if not secret_message:
+        return error_response("'secret_message' is required")
+
+    # TEXT STEGANOGRAPHY (ZWC)
+    if algorithm == 'zwc':
+        cover_text = data.get('cover_text')
+        if not cover_text:
+            return error_response("'cover_text' is required for text steganography")
+
+        encoding_bits = data.get('encoding_bits', 2)
+        insertion_method = data.get('insertion_method', 'between_words')
+
+        # Validate parameters
+        if encoding_bits not in VALID_ENCODING_BITS:
+            return error_response("'encoding_bits' must be 1 or 2")
+
+        if insertion_method not in VALID_INSERTION_METHODS:
+            return error_response("Invalid insertion_method")
+
+        # Encrypt if password provided
+        message_to_hide = secret_message
+        if password:
+            message_to_hide = security.encrypt_message(secret_message, password)
+
+        # Encode message
+        stego_text = text_stego.encode_message(
+            cover_text=cover_text,
+            secret_message=message_to_hide,
+            encoding_bits=encoding_bits,
+            insertion_method=insertion_method
+        )
+
+        return success_response({
+            'stego_text': stego_text,
+            'algorithm': 'zwc',
+            'encrypted': bool(password),
+            'encoding_bits': encoding_bits,
+            'insertion_method': insertion_method,
+            'cover_length': len(cover_text),
+            'stego_length': len(stego_text),
+            'message_length': len(secret_message)
+        }, message="Message encoded successfully in text")
+
+    # IMAGE STEGANOGRAPHY (LSB)
+    elif algorithm == 'lsb':
+        cover_image_b64 = data.get('cover_image')
+        if not cover_image_b64:
+            return error_response("'cover_image' (base64) is required for image steganography")
+
+        bits_per_pixel = data.get('bits_per_pixel', 2)
+        channel = data.get('channel', 2)  # Default: blue channel
+        output_format = data.get('output_format')  # Default: same as cover
+        compress_level = data.get('compress_level', image_stego.PNG_COMPRESS_LEVEL)
+
+        # Validate parameters
+        if bits_per_pixel not in VALID_BITS_PER_PIXEL:
+            return error_response("'bits_per_pixel' must be 1, 2, or 3")
+
+        if channel not in VALID_CHANNELS:
+            return error_response("'channel' must be 0 (red), 1 (green), or 2 (blue)")
+
+        # JSON numbers like 2.0 pass the checks above; index with real ints
+        bits_per_pixel, channel = int(bits_per_pixel), int(channel)
+
+        if output_format is not None and output_format not in VALID_OUTPUT_FORMATS:
+            return error_response("'output_format' must be 'png', 'bmp', 'tiff', or 'webp'")
+
+        if (not isinstance(compress_level, int) or isinstance(compress_level, bool)
+                or compress_level not in VALID_COMPRESS_LEVELS):
+            return error_response("'compress_level' must be an integer from 0 to 9")
+
+        # Decode base64 image (or read the uploaded file)
+        cover_image_data = read_image(cover_image_b64)
+
+        # Encrypt if password provided
+        message_to_hide = secret_message
+        if password:
+            message_to_hide = security.encrypt_message(secret_message, password)
+
+        # Encode message in image (entirely in memory, no temporary files)
+        stego_image_data, result = image_stego.encode_lsb_bytes(
+            image_bytes=cover_image_data,
+            message=message_to_hide,
+            bits_per_pixel=bits_per_pixel,
+            channel=channel,
+            output_format=output_format.upper() if output_format else None,
+            compress_level=compress_level
+        )
+
+        # Return the raw image file if requested (no base64 overhead)
+        image_format = result['image_format']
+        image_mimetype = IMAGE_MIMETYPES[image_format]
+        wants_image = request.accept_mimetypes.best_match(
+            ['application/json', image_mimetype]) == image_mimetype
+
+        # Rounded for display, e.g. 1.8 rather than 1.7999999999999998
+        capacity_used_percent = round(result['capacity_used_percent'], 2)
+
+        # Without ?format=binary the response type depends on Accept, so
+        # caches must key on it
+        negotiated = request.args.get('format') != 'binary'
+
+        if not negotiated or wants_image:
+            response = send_file(
+                io.BytesIO(stego_image_data),
+                mimetype=image_mimetype,
+                download_name=f'stego.{image_format.lower()}'
             )
-
-            return success_response({
-                'stego_text': stego_text,
-                'algorithm': 'zwc',
-                'encrypted': bool(password),
-                'encoding_bits': encoding_bits,
-                'insertion_method': insertion_method,
-                'cover_length': len(cover_text),
-                'stego_length': len(stego_text),
-                'message_length': len(secret_message)
-            }, message="Message encoded successfully in text")
-
-        # IMAGE STEGANOGRAPHY (LSB)
-        elif algorithm == 'lsb':
-            cover_image_b64 = data.get('cover_image')
-            if not cover_image_b64:
-                return error_response("'cover_image' (base64) is required for image steganography")
-
-            bits_per_pixel = data.get('bits_per_pixel', 2)
-            channel = data.get('channel', 2)  # Default: blue channel
-
-            # Validate parameters
-            if bits_per_pixel not in [1, 2, 3]:
-                return error_response("'bits_per_pixel' must be 1, 2, or 3")
-
-            if channel not in [0, 1, 2]:
-                return error_response("'channel' must be 0 (red), 1 (green), or 2 (blue)")
-
-            # Decrypt base64 image
-            cover_image_data = decode_base64_image(cover_image_b64)
-
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as cover_temp:
-                cover_temp.write(cover_image_data)
-                cover_temp_path = cover_temp.name
-
-            stego_temp_path = tempfile.mktemp(suffix='.png')
-
-            try:
-                # Encrypt if password provided
-                message_to_hide = secret_message
-                if password:
-                    message_to_hide = security.encrypt_message(secret_message, password)
-
-                # Encode message in image
-                result = image_stego.encode_lsb(
-                    image_path=cover_temp_path,
-                    message=message_to_hide,
-                    output_path=stego_temp_path,
-                    bits_per_pixel=bits_per_pixel,
-                    channel=channel
-                )
-
-                # Encode stego image to base64
-                stego_image_b64 = encode_image_to_base64(stego_temp_path)
-
-                return success_response({
-                    'stego_image': stego_image_b64,
-                    'algorithm': 'lsb',
-                    'encrypted': bool(password),
-                    'bits_per_pixel': bits_per_pixel,
-                    'channel': channel,
-                    'channel_name': ['red', 'green', 'blue'][channel],
-                    'pixels_modified': result['pixels_modified'],
-                    'capacity_used_percent': result['capacity_used_percent'],
-                    'message_length': len(secret_message)
-                }, message="Message encoded successfully in image")
-
-            finally:
-                # Cleanup temporary files
-                if os.path.exists(cover_temp_path):
-                    os.unlink(cover_temp_path)
-                if os.path.exists(stego_temp_path):
-                    os.unlink(stego_temp_path)
-
-        else:
-            return error_response(f"Unknown algorithm: '{algorithm}'. Use 'zwc' or 'lsb'")
-
-    except ValueError as e:
-        return error_response(str(e), 400)
-    except Exception as e:
-        return error_response(f"Encoding failed: {str(e)}", 500)
+            response.headers.update({
+                'X-Stego-Algorithm': 'lsb',
+                'X-Stego-Encrypted': str(bool(password)).lower(),
+                'X-Stego-Bits-Per-Pixel': str(bits_per_pixel),
+                'X-Stego-Channel': str(channel),
+                'X-Stego-Pixels-Modified': str(result['pixels_modified']),
+                'X-Stego-Capacity-Used-Percent': str(capacity_used_percent),
+                'X-Stego-Message-Length': str(len(secret_message))
+            })
+            if negotiated:
+                response.vary.add('Accept')
+            return response
+
+        response, status_code = success_response({
+            'stego_image': b64encode(stego_image_data).decode('ascii'),
+            'image_mimetype': image_mimetype,
+            'algorithm': 'lsb',
+            'encrypted': bool(password),
+            'bits_per_pixel': bits_per_pixel,
+            'channel': channel,
+            'channel_name': CHANNEL_NAMES[channel],
+            'pixels_modified': result['pixels_modified'],
+            'capacity_used_percent': capacity_used_percent,
+            'message_length': len(secret_message)
+        }, message="Message encoded successfully in image")
+        response.vary.add('Accept')
+        return response, status_code
+
+    else:
+        return error_response(f"Unknown algorithm: '{algorithm}'. Use 'zwc' or 'lsb'")
 
 
 # ============================================================================
@@ -351,109 +638,95 @@ def decode_message():
             "stego_text": "Hello​‌‍ world"
         }
     """
-    try:
-        data = request.get_json()
+    data = get_request_data()
 
-        if not data:
-            return error_response("No JSON data provided")
+    if not data:
+        return error_response("No JSON data provided")
 
-        algorithm = data.get('algorithm', '').lower()
-        password = data.get('password')
+    algorithm = data.get('algorithm', '').lower()
+    password = data.get('password')
 
-        # TEXT STEGANOGRAPHY (ZWC)
-        if algorithm == 'zwc':
-            stego_text = data.get('stego_text')
-            if not stego_text:
-                return error_response("'stego_text' is required")
+    # TEXT STEGANOGRAPHY (ZWC)
+    if algorithm == 'zwc':
+        stego_text = data.get('stego_text')
+        if not stego_text:
+            return error_response("'stego_text' is required")
 
-            encoding_bits = data.get('encoding_bits', 2)
+        encoding_bits = data.get('encoding_bits', 2)
 
-            # Validate parameters
-            if encoding_bits not in [1, 2]:
-                return error_response("'encoding_bits' must be 1 or 2")
+        # Validate parameters
+        if encoding_bits not in VALID_ENCODING_BITS:
+            return error_response("'encoding_bits' must be 1 or 2")
 
-            # Decode message
-            decoded_message = text_stego.decode_message(
-                stego_text=stego_text,
-                encoding_bits=encoding_bits
-            )
-
-            # Decrypt if password provided
-            if password:
-                try:
-                    decoded_message = security.decrypt_message(decoded_message, password)
-                except ValueError as e:
-                    return error_response(f"Decryption failed (wrong password?): {e}", 401)
-
-            return success_response({
-                'secret_message': decoded_message,
-                'algorithm': 'zwc',
-                'decrypted': bool(password),
-                'encoding_bits': encoding_bits,
-                'message_length': len(decoded_message)
-            }, message="Message decoded successfully from text")
-
-        # IMAGE STEGANOGRAPHY (LSB)
-        elif algorithm == 'lsb':
-            stego_image_b64 = data.get('stego_image')
-            if not stego_image_b64:
-                return error_response("'stego_image' (base64) is required")
-
-            bits_per_pixel = data.get('bits_per_pixel', 2)
-            channel = data.get('channel', 2)  # Default: blue channel
-
-            # Validate parameters
-            if bits_per_pixel not in [1, 2, 3]:
-                return error_response("'bits_per_pixel' must be 1, 2, or 3")
-
-            if channel not in [0, 1, 2]:
-                return error_response("'channel' must be 0 (red), 1 (green), or 2 (blue)")
-
-            # Decode base64 image
-            stego_image_data = decode_base64_image(stego_image_b64)
-
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as stego_temp:
-                stego_temp.write(stego_image_data)
-                stego_temp_path = stego_temp.name
+        # Decode message
+        decoded_message = text_stego.decode_message(
+            stego_text=stego_text,
+            encoding_bits=encoding_bits
+        )
 
+        # Decrypt if password provided
+        if password:
+            try:
+                decoded_message = security.decrypt_message(decoded_message, password)
+            except ValueError as e:
+                return error_response(f"Decryption failed (wrong password?): {e}", 401)
+
+        return success_response({
+            'secret_message': decoded_message,
+            'algorithm': 'zwc',
+            'decrypted': bool(password),
+            'encoding_bits': encoding_bits,
+            'message_length': len(decoded_message)
+        }, message="Message decoded successfully from text")
+
+    # IMAGE STEGANOGRAPHY (LSB)
+    elif algorithm == 'lsb':
+        stego_image_b64 = data.get('stego_image')
+        if not stego_image_b64:
+            return error_response("'stego_image' (base64) is required")
+
+        bits_per_pixel = data.get('bits_per_pixel', 2)
+        channel = data.get('channel', 2)  # Default: blue channel
+
+        # Validate parameters
+        if bits_per_pixel not in VALID_BITS_PER_PIXEL:
+            return error_response("'bits_per_pixel' must be 1, 2, or 3")
+
+        if channel not in VALID_CHANNELS:
+            return error_response("'channel' must be 0 (red), 1 (green), or 2 (blue)")
+
+        # JSON numbers like 2.0 pass the checks above; index with real ints
+        bits_per_pixel, channel = int(bits_per_pixel), int(channel)
+
+        # Decode base64 image (or read the uploaded file)
+        stego_image_data = read_image(stego_image_b64)
+
+        # Decode message from image (entirely in memory, no temporary files)
+        decoded_message = image_stego.decode_lsb_bytes(
+            image_bytes=stego_image_data,
+            bits_per_pixel=bits_per_pixel,
+            channel=channel
+        )
+
+        # Decrypt if password provided
+        if password:
             try:
-                # Decode message from image
-                decoded_message = image_stego.decode_lsb(
-                    stego_image_path=stego_temp_path,
-                    bits_per_pixel=bits_per_pixel,
-                    channel=channel
-                )
-
-                # Decrypt if password provided
-                if password:
-                    try:
-                        decoded_message = security.decrypt_message(decoded_message, password)
-                    except ValueError as e:
-                        return error_response(f"Decryption failed (wrong password?): {e}", 401)
-
-                return success_response({
-                    'secret_message': decoded_message,
-                    'algorithm': 'lsb',
-                    'decrypted': bool(password),
-                    'bits_per_pixel': bits_per_pixel,
-                    'channel': channel,
-                    'channel_name': ['red', 'green', 'blue'][channel],
-                    'message_length': len(decoded_message)
-                }, message="Message decoded successfully from image")
-
-            finally:
-                # Cleanup temporary file
-                if os.path.exists(stego_temp_path):
-                    os.unlink(stego_temp_path)
-
-        else:
-            return error_response(f"Unknown algorithm: '{algorithm}'. Use 'zwc' or 'lsb'")
-
-    except ValueError as e:
-        return error_response(str(e), 400)
-    except Exception as e:
-        return error_response(f"Decoding failed: {str(e)}", 500)
+                decoded_message = security.decrypt_message(decoded_message, password)
+            except ValueError as e:
+                return error_response(f"Decryption failed (wrong password?): {e}", 401)
+
+        return success_response({
+            'secret_message': decoded_message,
+            'algorithm': 'lsb',
+            'decrypted': bool(password),
+            'bits_per_pixel': bits_per_pixel,
+            'channel': channel,
+            'channel_name': CHANNEL_NAMES[channel],
+            'message_length': len(decoded_message)
+        }, message="Message decoded successfully from image")
+
+    else:
+        return error_response(f"Unknown algorithm: '{algorithm}'. Use 'zwc' or 'lsb'")
 
 
 # ============================================================================
@@ -481,50 +754,27 @@ def analyze_image():
             "stego_image": "data:image/png;base64,..."
         }
     """
-    try:
-        data = request.get_json()
-
-        if not data:
-            return error_response("No JSON data provided")
-
-        original_b64 = data.get('original_image')
-        stego_b64 = data.get('stego_image')
-
-        if not original_b64 or not stego_b64:
-            return error_response("Both 'original_image' and 'stego_image' are required")
-
-        # Decode base64 images
-        original_data = decode_base64_image(original_b64)
-        stego_data = decode_base64_image(stego_b64)
+    data = get_request_data()
 
-        # Save to temporary files
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as orig_temp:
-            orig_temp.write(original_data)
-            original_path = orig_temp.name
+    if not data:
+        return error_response("No JSON data provided")
 
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as stego_temp:
-            stego_temp.write(stego_data)
-            stego_path = stego_temp.name
+    original_b64 = data.get('original_image')
+    stego_b64 = data.get('stego_image')
 
-        try:
-            # Calculate metrics
-            metrics_summary = metrics.calculate_metrics_summary(original_path, stego_path)
+    if not original_b64 or not stego_b64:
+        return error_response("Both 'original_image' and 'stego_image' are required")
 
-            return success_response({
-                'metrics': metrics_summary
-            }, message="Image quality analysis completed")
+    # Decode base64 images (or read uploaded files)
+    original_data = read_image(original_b64)
+    stego_data = read_image(stego_b64)
 
-        finally:
-            # Cleanup temporary files
-            if os.path.exists(original_path):
-                os.unlink(original_path)
-            if os.path.exists(stego_path):
-                os.unlink(stego_path)
+    # Calculate metrics (entirely in memory, no temporary files)
+    metrics_summary = metrics.calculate_metrics_summary_bytes(original_data, stego_data)
 
-    except ValueError as e:
-        return error_response(str(e), 400)
-    except Exception as e:
-        return error_response(f"Analysis failed: {str(e)}", 500)
+    return success_response({
+        'metrics': metrics_summary
+    }, message="Image quality analysis completed")
 
 
 # ============================================================================
@@ -549,6 +799,34 @@ def internal_error(error):
     return error_response("Internal server error", 500)
 
 
+@app.errorhandler(HTTPException)
+def http_error(error):
+    """Handle other HTTP errors (bad JSON body, wrong method, ...)."""
+    response, status_code = error_response(error.description, error.code)
+
+    # Keep headers the error carries, e.g. Allow on 405 Method Not Allowed
+    for name, value in error.get_headers():
+        if name != 'Content-Type':
+            response.headers[name] = value
+
+    return response, status_code
+
+
+@app.errorhandler(ValueError)
+def invalid_input(error):
+    """Handle invalid input raised while processing a request."""
+    return error_response(str(error), 400)
+
+
+@app.errorhandler(Exception)
+def processing_error(error):
+    """Handle unexpected errors, naming the operation that failed."""
+    operation = ENDPOINT_OPERATIONS.get(request.endpoint)
+    if operation is None:
+        return error_response("Internal server error", 500)
+    return error_response(f"{operation} failed: {str(error)}", 500)
+
+
 # ============================================================================
 # SECTION 8: Main Entry Point
 # ============================================================================
@@ -567,5 +845,7 @@ if __name__ == '__main__':
     print("Starting server on http://localhost:5000")
     print("=" * 70 + "\n")
 
-    # Run Flask development server
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Run Flask development server (threaded by default). The debugger and
+    # reloader are opt-in with FLASK_DEBUG=1; use Gunicorn in production
+    debug = os.environ.get('FLASK_DEBUG') == '1'
+    app.run(debug=debug, host='0.0.0.0', port=5000)
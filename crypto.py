@@ -9,12 +9,17 @@ Fernet provides:
 - HMAC for authentication
 - Automatic key derivation from passwords
 - Safe base64 encoding
+
+Fernet is built on cryptography's OpenSSL backend, so AES and HMAC run in
+OpenSSL's assembly implementations (AES-NI / SHA extensions on CPUs that
+have them). There is no pure-Python cipher code in this module.
 """
 
 import base64
 import hashlib
 import secrets
 from cryptography.fernet import Fernet
+from cryptography.hazmat.backends.openssl import backend as openssl_backend
 
 
 def derive_key_from_password(password: str) -> bytes:
@@ -219,6 +224,7 @@ def get_encryption_info(encrypted_token: str) -> dict:
             'format': 'Fernet token (1B version + 8B timestamp + 16B IV + ciphertext + 32B HMAC)',
             'encoding': 'base64',
             'algorithm': 'AES-128-CBC with HMAC-SHA256',
+            'backend': openssl_backend.openssl_version_text(),
             'kdf': 'SHA-256 password hash (for this demo)'
         }
     except Exception as e:
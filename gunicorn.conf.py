@@ -0,0 +1,30 @@
+"""
+Gunicorn configuration for the Steganography API
+
+Usage:
+    pip install gunicorn
+    gunicorn -c gunicorn.conf.py app:app
+
+Settings can be overridden with environment variables (WEB_CONCURRENCY,
+GUNICORN_THREADS, PORT) or on the command line.
+"""
+
+import os
+
+# One worker process per CPU core: image encoding is CPU-bound
+workers = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+
+# Threads keep a worker busy while clients upload or download (Pillow,
+# zlib and NumPy release the GIL during image work)
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Import the app (Flask, Pillow, NumPy, scikit-image) once in the master;
+# the workers share those pages copy-on-write after the fork
+preload_app = True
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Large images can take a few seconds to encode or analyze
+timeout = 60
+keepalive = 5
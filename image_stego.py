@@ -16,7 +16,9 @@ Organization:
 
 from PIL import Image
 import numpy as np
-from typing import Tuple, Optional
+import io
+import struct
+from typing import BinaryIO, Tuple, Optional, Union
 
 
 # ============================================================================
@@ -28,17 +30,40 @@ from typing import Tuple, Optional
 HEADER_SIZE_BYTES = 4
 
 # Supported image formats
-SUPPORTED_FORMATS = ['PNG', 'BMP', 'TIFF']
+SUPPORTED_FORMATS = ['PNG', 'BMP', 'TIFF', 'WEBP']
 
 # Color channels
 CHANNEL_RED = 0
 CHANNEL_GREEN = 1
 CHANNEL_BLUE = 2
 
+# zlib level for PNG output (0-9). Level 1 encodes noticeably faster than
+# Pillow's default of 6; the LSB noise leaves little for higher levels
+PNG_COMPRESS_LEVEL = 1
+
+# Allowed number of LSBs to modify per pixel
+VALID_BITS_PER_PIXEL = (1, 2, 3)
+
 # Default encoding parameters
 DEFAULT_BITS_PER_PIXEL = 1  # How many LSBs to modify per pixel
 DEFAULT_CHANNEL = CHANNEL_BLUE  # Which color channel to use
 
+# An image file: a path, or a binary file-like object such as io.BytesIO
+# (Pillow reads from and writes to either)
+ImageFile = Union[str, BinaryIO]
+
+# How many bytes to read when sniffing image dimensions from the file header
+# (PNG needs 24, BMP 26)
+HEADER_SNIFF_BYTES = 32
+
+# Magic numbers at the start of each supported format's file
+IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'PNG'),
+    (b'BM', 'BMP'),
+    (b'II*\x00', 'TIFF'),  # Little-endian TIFF
+    (b'MM\x00*', 'TIFF')   # Big-endian TIFF
+)
+
 
 # ============================================================================
 # SECTION 2: BIT MANIPULATION HELPERS
@@ -127,6 +152,51 @@ def bits_to_int(bits: str) -> int:
     return int(bits, 2)
 
 
+def message_to_bit_array(message: str) -> np.ndarray:
+    """
+    Convert a text message to a NumPy array of bits.
+
+    Produces exactly the same bits as message_to_bits, but as a uint8
+    array of 0/1 values that the vectorized LSB functions can use.
+
+    Args:
+        message: Text message to convert
+
+    Returns:
+        1D uint8 array of 0s and 1s
+
+    Example:
+        >>> message_to_bit_array("Hi")
+        array([0, 1, 0, 0, 1, 0, 0, 0, 0, 1, 1, 0, 1, 0, 0, 1], dtype=uint8)
+    """
+    try:
+        # Characters up to U+00FF are exactly one byte each
+        message_bytes = message.encode('latin-1')
+    except UnicodeEncodeError:
+        # Wider characters use more than 8 bits in message_to_bits,
+        # so reuse it to keep the bit layout identical
+        return np.frombuffer(message_to_bits(message).encode('ascii'),
+                             dtype=np.uint8) - ord('0')
+
+    return np.unpackbits(np.frombuffer(message_bytes, dtype=np.uint8))
+
+
+def bit_array_to_message(bits: np.ndarray) -> str:
+    """
+    Convert a NumPy array of bits back to a text message.
+
+    Vectorized counterpart of bits_to_message: only complete bytes are used.
+
+    Args:
+        bits: 1D uint8 array of 0s and 1s
+
+    Returns:
+        Decoded text message
+    """
+    complete_bits = bits[:bits.size - bits.size % 8]
+    return np.packbits(complete_bits).tobytes().decode('latin-1')
+
+
 def modify_lsb(pixel_value: int, bit: str, num_lsb: int = 1) -> int:
     """
     Modify the least significant bit(s) of a pixel value.
@@ -201,16 +271,98 @@ def extract_lsb(pixel_value: int, num_lsb: int = 1) -> str:
     return '0'
 
 
+def _validate_lsb_params(bits_per_pixel: int, channel: int) -> Tuple[int, int]:
+    """
+    Check bits_per_pixel and channel, returning them as plain ints.
+
+    Integral floats such as 2.0 (common in JSON) are accepted, since they
+    compare equal to the allowed values but cannot be used as indices.
+
+    Raises:
+        ValueError: If either value is out of range
+    """
+    if bits_per_pixel not in VALID_BITS_PER_PIXEL:
+        raise ValueError("bits_per_pixel must be 1, 2, or 3")
+    if channel not in (CHANNEL_RED, CHANNEL_GREEN, CHANNEL_BLUE):
+        raise ValueError("channel must be 0 (red), 1 (green), or 2 (blue)")
+    return int(bits_per_pixel), int(channel)
+
+
+def _embed_bits(pixels: np.ndarray, bits: np.ndarray, bits_per_pixel: int,
+                channel: int) -> int:
+    """
+    Write a bit array into the LSBs of one channel, in row-major pixel order.
+
+    All pixels are updated in one vectorized NumPy operation instead of a
+    Python loop per pixel.
+
+    Args:
+        pixels: C-contiguous [height, width, channels] array, modified in place
+        bits: 1D uint8 array of 0s and 1s
+        bits_per_pixel: How many LSBs to modify (1, 2, or 3)
+        channel: Which color channel (0=R, 1=G, 2=B)
+
+    Returns:
+        Number of pixels modified
+    """
+    # Pad the last group with zeros (same as the old per-pixel ljust)
+    padding = -bits.size % bits_per_pixel
+    if padding:
+        bits = np.concatenate([bits, np.zeros(padding, dtype=np.uint8)])
+
+    # Combine each group of bits into one value, first bit most significant
+    groups = bits.reshape(-1, bits_per_pixel)
+    values = groups[:, 0].copy()
+    for i in range(1, bits_per_pixel):
+        values = (values << 1) | groups[:, i]
+
+    # View of the selected channel for every pixel, in row-major order
+    channel_values = pixels.reshape(-1, pixels.shape[2])[:values.size, channel]
+
+    # Clear the LSBs, then set them (e.g. 0xFE / 0xFC / 0xF8)
+    clear_mask = np.uint8((0xFF << bits_per_pixel) & 0xFF)
+    channel_values[:] = (channel_values & clear_mask) | values
+
+    return values.size
+
+
+def _extract_bits(pixels: np.ndarray, num_bits: int, bits_per_pixel: int,
+                  channel: int) -> np.ndarray:
+    """
+    Read bits back from the LSBs of one channel, in row-major pixel order.
+
+    Args:
+        pixels: [height, width, channels] array
+        num_bits: How many bits to read (fewer are returned if the image is too small)
+        bits_per_pixel: How many LSBs were used (1, 2, or 3)
+        channel: Which color channel was used (0=R, 1=G, 2=B)
+
+    Returns:
+        1D uint8 array of 0s and 1s
+    """
+    num_pixels = -(-num_bits // bits_per_pixel)  # Ceiling division
+    channel_values = pixels.reshape(-1, pixels.shape[2])[:num_pixels, channel]
+    values = channel_values & ((1 << bits_per_pixel) - 1)
+
+    # Split each value back into its bits, most significant first
+    shifts = np.arange(bits_per_pixel - 1, -1, -1, dtype=np.uint8)
+    bits = ((values[:, np.newaxis] >> shifts) & 1).reshape(-1)
+
+    return bits[:num_bits]
+
+
 # ============================================================================
 # SECTION 3: IMAGE LOADING AND SAVING (B1)
 # ============================================================================
 
-def load_image(image_path: str) -> Tuple[np.ndarray, str]:
+def load_image(image_path: ImageFile, writable: bool = True) -> Tuple[np.ndarray, str]:
     """
     Load an image from disk and convert to numpy array.
 
     Args:
-        image_path: Path to the image file
+        image_path: Path to the image file, or a binary file-like object
+        writable: Set to False when the pixels are only read (decoding,
+                  metrics); this skips one full-frame copy of the image
 
     Returns:
         Tuple of (pixel_array, image_format)
@@ -239,35 +391,121 @@ def load_image(image_path: str) -> Tuple[np.ndarray, str]:
 
     # Convert to numpy array [height, width, 3]
     # Each pixel has 3 values: [Red, Green, Blue], each 0-255
-    pixel_array = np.array(img, dtype=np.uint8)
+    # np.asarray wraps Pillow's buffer read-only; np.array copies it again
+    if writable:
+        pixel_array = np.array(img, dtype=np.uint8)
+    else:
+        pixel_array = np.asarray(img, dtype=np.uint8)
 
     return pixel_array, img_format
 
 
-def save_image(pixel_array: np.ndarray, output_path: str,
-               image_format: str = 'PNG') -> None:
+def save_image(pixel_array: np.ndarray, output_path: ImageFile,
+               image_format: str = 'PNG',
+               compress_level: int = PNG_COMPRESS_LEVEL) -> None:
     """
     Save a numpy pixel array as an image file.
 
     Args:
         pixel_array: 3D numpy array [height, width, channels]
-        output_path: Where to save the image
+        output_path: Where to save the image (path or writable file-like object)
         image_format: Format to save as (PNG, BMP, etc.)
+                      WEBP is always saved lossless, or the LSBs would be lost
+        compress_level: zlib level for PNG (0 = none/fastest, 9 = smallest)
 
     Example:
         >>> save_image(modified_pixels, "stego.png", "PNG")
     """
     # Create PIL Image from numpy array
-    img = Image.fromarray(pixel_array.astype(np.uint8), 'RGB')
+    # copy=False: no extra full-frame copy when pixels are already uint8
+    img = Image.fromarray(pixel_array.astype(np.uint8, copy=False), 'RGB')
+
+    # Lossless WebP at its fastest effort setting: several times faster
+    # to encode than PNG at about the same size
+    save_options = {}
+    if image_format == 'WEBP':
+        save_options = {'lossless': True, 'exact': True, 'quality': 0, 'method': 0}
+    elif image_format == 'PNG':
+        save_options = {'compress_level': compress_level}
 
     # Save to disk
-    img.save(output_path, format=image_format)
+    img.save(output_path, format=image_format, **save_options)
+
+
+def detect_image_format(image_data: bytes) -> Optional[str]:
+    """
+    Identify a supported image format from the first bytes of the file.
+
+    Only the magic number is checked (12 bytes are enough), so non-images
+    can be rejected before the full payload is decoded.
+
+    Args:
+        image_data: The first bytes of the image file
+
+    Returns:
+        'PNG', 'BMP', 'TIFF' or 'WEBP', or None if it is not a supported format
+
+    Example:
+        >>> detect_image_format(b'\\x89PNG\\r\\n\\x1a\\n')
+        'PNG'
+    """
+    for signature, img_format in IMAGE_SIGNATURES:
+        if image_data.startswith(signature):
+            return img_format
+
+    # WebP: a RIFF container ('RIFF', 4-byte size, then 'WEBP')
+    if image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP':
+        return 'WEBP'
+
+    return None
+
+
+def _parse_image_header(image_data: bytes) -> Optional[Tuple[int, int, str]]:
+    """
+    Read width, height and format straight from the file header.
+
+    This avoids decoding any pixel data, so it costs the same for a
+    10x10 image as for a 8000x8000 one.
+
+    Args:
+        image_data: The first bytes of the image file
+
+    Returns:
+        Tuple of (width, height, format), or None if the header
+        is not a PNG or BMP header we can read
+
+    Example:
+        >>> _parse_image_header(open("cover.png", "rb").read(64))
+        (512, 512, 'PNG')
+    """
+    img_format = detect_image_format(image_data)
+
+    # PNG: 8-byte signature, then the IHDR chunk with big-endian width/height
+    if img_format == 'PNG' and len(image_data) >= 24:
+        width, height = struct.unpack('>II', image_data[16:24])
+        return width, height, 'PNG'
+
+    # BMP: 'BM', then a DIB header whose layout depends on its size
+    if img_format == 'BMP' and len(image_data) >= 26:
+        dib_size = struct.unpack('<I', image_data[14:18])[0]
+        if dib_size == 12:
+            # Old OS/2 BITMAPCOREHEADER uses 16-bit unsigned dimensions
+            width, height = struct.unpack('<HH', image_data[18:22])
+        else:
+            # Height is negative for top-down bitmaps
+            width, height = struct.unpack('<ii', image_data[18:26])
+        return abs(width), abs(height), 'BMP'
+
+    return None
 
 
 def get_image_capacity(image_path: str, bits_per_pixel: int = 1) -> dict:
     """
     Calculate how many bytes can be hidden in an image.
 
+    Only the image dimensions are needed, so they are read from the file
+    header instead of decoding the whole image.
+
     Args:
         image_path: Path to the image
         bits_per_pixel: How many LSBs to use (1, 2, or 3)
@@ -275,12 +513,28 @@ def get_image_capacity(image_path: str, bits_per_pixel: int = 1) -> dict:
     Returns:
         Dictionary with capacity information
 
+    Raises:
+        ValueError: If image format is not supported
+
     Example:
         >>> capacity = get_image_capacity("image.png", bits_per_pixel=1)
         >>> print(capacity['max_bytes'])
     """
-    pixels, _ = load_image(image_path)
-    height, width, channels = pixels.shape
+    with open(image_path, 'rb') as f:
+        header = _parse_image_header(f.read(HEADER_SNIFF_BYTES))
+
+    if header is not None:
+        width, height, img_format = header
+    else:
+        # Unknown header (e.g. TIFF): Pillow only parses the header on open,
+        # pixels are not decoded unless we call load()
+        with Image.open(image_path) as img:
+            width, height = img.size
+            img_format = img.format
+
+    if img_format not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported format: {img_format}. "
+                        f"Supported: {SUPPORTED_FORMATS}")
 
     total_pixels = height * width
 
@@ -309,8 +563,10 @@ def get_image_capacity(image_path: str, bits_per_pixel: int = 1) -> dict:
 # SECTION 4: LSB ENCODING (B1)
 # ============================================================================
 
-def encode_lsb(image_path: str, message: str, output_path: str,
-               bits_per_pixel: int = 1, channel: int = CHANNEL_BLUE) -> dict:
+def encode_lsb(image_path: ImageFile, message: str, output_path: ImageFile,
+               bits_per_pixel: int = 1, channel: int = CHANNEL_BLUE,
+               output_format: Optional[str] = None,
+               compress_level: int = PNG_COMPRESS_LEVEL) -> dict:
     """
     Hide a message in an image using LSB steganography.
 
@@ -324,11 +580,14 @@ def encode_lsb(image_path: str, message: str, output_path: str,
     5. Save stego image
 
     Args:
-        image_path: Path to cover image
+        image_path: Path to cover image, or a binary file-like object
         message: Secret message to hide
-        output_path: Where to save stego image
+        output_path: Where to save stego image (path or writable file-like
+                     object, e.g. io.BytesIO to stay in memory)
         bits_per_pixel: How many LSBs to modify (1, 2, or 3)
         channel: Which color channel (0=R, 1=G, 2=B)
+        output_format: Format of the stego image (default: same as the cover)
+        compress_level: zlib level (0-9) if the stego image is a PNG
 
     Returns:
         Dictionary with encoding statistics
@@ -341,21 +600,73 @@ def encode_lsb(image_path: str, message: str, output_path: str,
         >>> print(result['success'])
         True
     """
+    if output_format is not None and output_format not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported output format: {output_format}. "
+                         f"Supported: {SUPPORTED_FORMATS}")
+
     # Step 1: Load the image
     pixels, img_format = load_image(image_path)
-    height, width, channels = pixels.shape
+    img_format = output_format or img_format
+
+    # Steps 2-5: Hide header + message in the pixel LSBs
+    result = encode_lsb_array(pixels, message, bits_per_pixel=bits_per_pixel,
+                              channel=channel)
+
+    # Step 6: Save the stego image
+    save_image(pixels, output_path, img_format, compress_level=compress_level)
+
+    # Return statistics
+    result['image_format'] = img_format
+    result['output_path'] = output_path
+    return result
+
+
+def encode_lsb_array(pixels: np.ndarray, message: str, bits_per_pixel: int = 1,
+                     channel: int = CHANNEL_BLUE) -> dict:
+    """
+    Hide a message in an already loaded pixel array, modifying it in place.
+
+    This is the core of encode_lsb() without any file handling, for callers
+    that already hold the image as a NumPy array.
+
+    Args:
+        pixels: C-contiguous, writable uint8 array [height, width, channels]
+        message: Secret message to hide
+        bits_per_pixel: How many LSBs to modify (1, 2, or 3)
+        channel: Which color channel (0=R, 1=G, 2=B)
+
+    Returns:
+        Dictionary with encoding statistics
+
+    Raises:
+        ValueError: If the message is too large for the image or the array
+                    cannot be modified in place
+
+    Example:
+        >>> pixels, fmt = load_image("cover.png")
+        >>> result = encode_lsb_array(pixels, "Secret message")
+        >>> save_image(pixels, "stego.png", fmt)
+    """
+    bits_per_pixel, channel = _validate_lsb_params(bits_per_pixel, channel)
+
+    # Bits are written through a reshaped view, which must not be a copy
+    if not (pixels.flags.c_contiguous and pixels.flags.writeable):
+        raise ValueError("pixels must be a C-contiguous, writable array")
+
+    height, width = pixels.shape[:2]
 
     # Step 2: Convert message to bits
-    message_bits = message_to_bits(message)
-    message_length = len(message_bits)
+    message_bits = message_to_bit_array(message)
+    message_length = message_bits.size
 
     # Step 3: Create header (stores message length)
     # Header is the message length as a 32-bit integer
-    header_bits = int_to_bits(message_length, num_bits=32)
+    header_bits = np.unpackbits(
+        np.frombuffer(message_length.to_bytes(HEADER_SIZE_BYTES, 'big'), dtype=np.uint8))
 
     # Combine header + message
-    all_bits = header_bits + message_bits
-    total_bits = len(all_bits)
+    all_bits = np.concatenate([header_bits, message_bits])
+    total_bits = all_bits.size
 
     # Step 4: Check capacity
     total_pixels = height * width
@@ -370,46 +681,9 @@ def encode_lsb(image_path: str, message: str, output_path: str,
         )
 
     # Step 5: Encode bits into pixels
-    # We'll modify pixels in row-major order: (0,0), (0,1), (0,2), ...
-    bit_index = 0
-
-    for row in range(height):
-        for col in range(width):
-            if bit_index >= total_bits:
-                # All bits encoded!
-                break
-
-            # Get the bit(s) to encode
-            if bits_per_pixel == 1:
-                bit_to_encode = all_bits[bit_index]
-                bit_index += 1
-            elif bits_per_pixel == 2:
-                bit_to_encode = all_bits[bit_index:bit_index+2]
-                bit_index += 2
-                # Pad if necessary
-                if len(bit_to_encode) < 2:
-                    bit_to_encode = bit_to_encode.ljust(2, '0')
-            elif bits_per_pixel == 3:
-                bit_to_encode = all_bits[bit_index:bit_index+3]
-                bit_index += 3
-                # Pad if necessary
-                if len(bit_to_encode) < 3:
-                    bit_to_encode = bit_to_encode.ljust(3, '0')
-            else:
-                raise ValueError("bits_per_pixel must be 1, 2, or 3")
-
-            # Modify the LSB of the selected channel
-            original_value = pixels[row, col, channel]
-            modified_value = modify_lsb(original_value, bit_to_encode, bits_per_pixel)
-            pixels[row, col, channel] = modified_value
-
-        if bit_index >= total_bits:
-            break
-
-    # Step 6: Save the stego image
-    save_image(pixels, output_path, img_format)
+    # Pixels are modified in row-major order: (0,0), (0,1), (0,2), ...
+    pixels_modified = _embed_bits(pixels, all_bits, bits_per_pixel, channel)
 
-    # Return statistics
     return {
         'success': True,
         'message_length': len(message),
@@ -419,17 +693,57 @@ def encode_lsb(image_path: str, message: str, output_path: str,
         'bits_per_pixel': bits_per_pixel,
         'channel_used': ['Red', 'Green', 'Blue'][channel],
         'image_dimensions': f'{width}x{height}',
-        'pixels_modified': bit_index // bits_per_pixel,
-        'capacity_used_percent': (total_bits / max_bits) * 100,
-        'output_path': output_path
+        'pixels_modified': pixels_modified,
+        'capacity_used_percent': (total_bits / max_bits) * 100
     }
 
 
+def encode_lsb_bytes(image_bytes: bytes, message: str, bits_per_pixel: int = 1,
+                     channel: int = CHANNEL_BLUE,
+                     output_format: Optional[str] = None,
+                     compress_level: int = PNG_COMPRESS_LEVEL) -> Tuple[bytes, dict]:
+    """
+    Hide a message in an image held in memory (no temporary files).
+
+    Same as encode_lsb(), but takes the cover image as bytes and returns
+    the stego image as bytes. Used by the API, which receives and sends
+    images as base64 and never needs them on disk.
+
+    Args:
+        image_bytes: Encoded cover image (PNG, BMP, TIFF, or WEBP file contents)
+        message: Secret message to hide
+        bits_per_pixel: How many LSBs to modify (1, 2, or 3)
+        channel: Which color channel (0=R, 1=G, 2=B)
+        output_format: Format of the stego image (default: same as the cover)
+        compress_level: zlib level (0-9) if the stego image is a PNG
+
+    Returns:
+        Tuple of (stego_image_bytes, statistics)
+        - stego_image_bytes: Encoded stego image
+        - statistics: Same dictionary as encode_lsb(), without 'output_path'
+
+    Raises:
+        ValueError: If message is too large for the image
+
+    Example:
+        >>> stego_bytes, result = encode_lsb_bytes(cover_bytes, "Secret message")
+        >>> print(result['image_format'])
+        PNG
+    """
+    output = io.BytesIO()
+    result = encode_lsb(io.BytesIO(image_bytes), message, output,
+                        bits_per_pixel=bits_per_pixel, channel=channel,
+                        output_format=output_format, compress_level=compress_level)
+    del result['output_path']
+
+    return output.getvalue(), result
+
+
 # ============================================================================
 # SECTION 5: LSB DECODING (B1)
 # ============================================================================
 
-def decode_lsb(stego_image_path: str, bits_per_pixel: int = 1,
+def decode_lsb(stego_image_path: ImageFile, bits_per_pixel: int = 1,
                channel: int = CHANNEL_BLUE) -> str:
     """
     Extract a hidden message from a stego image.
@@ -443,7 +757,7 @@ def decode_lsb(stego_image_path: str, bits_per_pixel: int = 1,
     4. Convert bits back to text
 
     Args:
-        stego_image_path: Path to stego image
+        stego_image_path: Path to stego image, or a binary file-like object
         bits_per_pixel: How many LSBs were used (1, 2, or 3)
         channel: Which color channel was used (0=R, 1=G, 2=B)
 
@@ -456,56 +770,69 @@ def decode_lsb(stego_image_path: str, bits_per_pixel: int = 1,
         'Secret message'
     """
     # Step 1: Load the stego image
-    pixels, _ = load_image(stego_image_path)
-    height, width, channels = pixels.shape
+    pixels, _ = load_image(stego_image_path, writable=False)
 
-    # Step 2: Extract ALL bits we need in one pass
-    # First extract header to know message length, then extract that many bits
+    # Steps 2-4: Read header + message from the pixel LSBs
+    return decode_lsb_array(pixels, bits_per_pixel=bits_per_pixel, channel=channel)
 
-    extracted_bits = []
-    pixel_index = 0
-    total_pixels = height * width
 
-    # First, extract header (32 bits)
-    header_bits_needed = 32
-    bits_collected = 0
+def decode_lsb_array(pixels: np.ndarray, bits_per_pixel: int = 1,
+                     channel: int = CHANNEL_BLUE) -> str:
+    """
+    Extract a hidden message from an already loaded pixel array.
 
-    while bits_collected < header_bits_needed and pixel_index < total_pixels:
-        row = pixel_index // width
-        col = pixel_index % width
+    This is the core of decode_lsb() without any file handling.
 
-        pixel_value = pixels[row, col, channel]
-        lsb = extract_lsb(pixel_value, bits_per_pixel)
-        extracted_bits.append(lsb)
-        bits_collected += len(lsb)
-        pixel_index += 1
+    Args:
+        pixels: uint8 array [height, width, channels] (may be read-only)
+        bits_per_pixel: How many LSBs were used (1, 2, or 3)
+        channel: Which color channel was used (0=R, 1=G, 2=B)
 
-    # Decode header to get message length
-    header_bits_str = ''.join(extracted_bits)[:32]
-    message_length_bits = bits_to_int(header_bits_str)
+    Returns:
+        Decoded secret message
 
-    # Now extract message bits
-    total_bits_needed = 32 + message_length_bits
+    Example:
+        >>> pixels, _ = load_image("stego.png", writable=False)
+        >>> message = decode_lsb_array(pixels, bits_per_pixel=1)
+    """
+    bits_per_pixel, channel = _validate_lsb_params(bits_per_pixel, channel)
 
-    while bits_collected < total_bits_needed and pixel_index < total_pixels:
-        row = pixel_index // width
-        col = pixel_index % width
+    # Step 2: Extract header (first 32 bits) to get message length
+    header_bits = _extract_bits(pixels, HEADER_SIZE_BYTES * 8, bits_per_pixel, channel)
+    message_length_bits = int.from_bytes(np.packbits(header_bits).tobytes(), 'big')
 
-        pixel_value = pixels[row, col, channel]
-        lsb = extract_lsb(pixel_value, bits_per_pixel)
-        extracted_bits.append(lsb)
-        bits_collected += len(lsb)
-        pixel_index += 1
+    # Step 3: Extract header + message bits (stops early if the image runs out)
+    all_bits = _extract_bits(pixels, HEADER_SIZE_BYTES * 8 + message_length_bits,
+                             bits_per_pixel, channel)
 
     # Step 4: Convert bits to message
-    all_bits_str = ''.join(extracted_bits)
-    message_bits_str = all_bits_str[32:32 + message_length_bits]
-
-    decoded_message = bits_to_message(message_bits_str)
+    decoded_message = bit_array_to_message(all_bits[HEADER_SIZE_BYTES * 8:])
 
     return decoded_message
 
 
+def decode_lsb_bytes(image_bytes: bytes, bits_per_pixel: int = 1,
+                     channel: int = CHANNEL_BLUE) -> str:
+    """
+    Extract a hidden message from a stego image held in memory.
+
+    Same as decode_lsb(), but takes the image as bytes instead of a path.
+
+    Args:
+        image_bytes: Encoded stego image (PNG, BMP, TIFF, or WEBP file contents)
+        bits_per_pixel: How many LSBs were used (1, 2, or 3)
+        channel: Which color channel was used (0=R, 1=G, 2=B)
+
+    Returns:
+        Decoded secret message
+
+    Example:
+        >>> message = decode_lsb_bytes(stego_bytes, bits_per_pixel=1)
+    """
+    return decode_lsb(io.BytesIO(image_bytes), bits_per_pixel=bits_per_pixel,
+                      channel=channel)
+
+
 # ============================================================================
 # SECTION 6: MULTI-BIT CAPACITY (B2)
 # ============================================================================
@@ -531,7 +858,7 @@ def encode_lsb_variable(image_path: str, message: str, output_path: str,
         >>> result = encode_lsb_variable("cover.png", "Long message...",
         ...                              "stego.png", bits_per_pixel=3)
     """
-    if bits_per_pixel not in [1, 2, 3]:
+    if bits_per_pixel not in VALID_BITS_PER_PIXEL:
         raise ValueError("bits_per_pixel must be 1, 2, or 3")
 
     return encode_lsb(image_path, message, output_path,
@@ -549,7 +876,7 @@ def decode_lsb_variable(stego_image_path: str, bits_per_pixel: int = 1) -> str:
     Returns:
         Decoded message
     """
-    if bits_per_pixel not in [1, 2, 3]:
+    if bits_per_pixel not in VALID_BITS_PER_PIXEL:
         raise ValueError("bits_per_pixel must be 1, 2, or 3")
 
     return decode_lsb(stego_image_path, bits_per_pixel=bits_per_pixel)
@@ -570,8 +897,8 @@ def compare_images(original_path: str, stego_path: str) -> dict:
     Returns:
         Dictionary with comparison metrics
     """
-    orig_pixels, _ = load_image(original_path)
-    stego_pixels, _ = load_image(stego_path)
+    orig_pixels, _ = load_image(original_path, writable=False)
+    stego_pixels, _ = load_image(stego_path, writable=False)
 
     # Calculate differences
     diff = np.abs(orig_pixels.astype(int) - stego_pixels.astype(int))
@@ -697,8 +1024,8 @@ def calculate_mse(original_path: str, stego_path: str) -> float:
         MSE: 0.3251
     """
     # Load both images
-    orig_pixels, _ = load_image(original_path)
-    stego_pixels, _ = load_image(stego_path)
+    orig_pixels, _ = load_image(original_path, writable=False)
+    stego_pixels, _ = load_image(stego_path, writable=False)
 
     # Convert to float for accurate calculation
     orig_float = orig_pixels.astype(float)
@@ -790,10 +1117,11 @@ def calculate_ssim(original_path: str, stego_path: str) -> float:
         If not available, falls back to simple correlation-based measure.
     """
     # Load both images
-    orig_pixels, _ = load_image(original_path)
-    stego_pixels, _ = load_image(stego_path)
+    orig_pixels, _ = load_image(original_path, writable=False)
+    stego_pixels, _ = load_image(stego_path, writable=False)
 
-    # Try to use scikit-image's SSIM (most accurate)
+    # Try to use scikit-image's SSIM (most accurate). Imported here, not at
+    # module level: skimage roughly quadruples the import time of this module
     try:
         from skimage.metrics import structural_similarity as ssim
         # Calculate SSIM for multichannel (RGB) images
@@ -9,23 +9,46 @@ This module provides functions to calculate quality metrics for image steganogra
 These metrics help evaluate how imperceptible the steganography is.
 """
 
+import io
+import os
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple
 
+from image_stego import load_image
+
+# SciPy is optional (it is installed with scikit-image): without it SSIM
+# uses a simpler global formula
+try:
+    from scipy.ndimage import uniform_filter
+except ImportError:
+    uniform_filter = None
+
+
+# Image decoding and SSIM channels run in parallel threads (Pillow's
+# decoders and scipy's filters release the GIL). On single-core hosts
+# threads only add overhead, so no pool is created
+METRICS_WORKERS = min(3, os.cpu_count() or 1)
+_metrics_pool = ThreadPoolExecutor(max_workers=METRICS_WORKERS) if METRICS_WORKERS > 1 else None
+
+# SSIM window and stability constants for 8-bit images (the defaults of
+# scikit-image's structural_similarity: 7x7 uniform window, sample covariance)
+SSIM_WIN_SIZE = 7
+SSIM_C1 = (0.01 * 255) ** 2
+SSIM_C2 = (0.03 * 255) ** 2
+
 
 def load_image_for_metrics(image_path: str):
     """
     Load an image as numpy array for metrics calculation.
 
     Args:
-        image_path: Path to image file
+        image_path: Path to image file (or a file-like object such as BytesIO)
 
     Returns:
         Tuple of (pixel_array, format)
     """
-    # Import here to avoid circular dependency
-    from image_stego import load_image
-    return load_image(image_path)
+    return load_image(image_path, writable=False)
 
 
 def calculate_mse(original_path: str, stego_path: str) -> float:
@@ -58,12 +81,19 @@ def calculate_mse(original_path: str, stego_path: str) -> float:
     orig_pixels, _ = load_image_for_metrics(original_path)
     stego_pixels, _ = load_image_for_metrics(stego_path)
 
-    # Convert to float for accurate calculation
-    orig_float = orig_pixels.astype(float)
-    stego_float = stego_pixels.astype(float)
+    return _mse_from_arrays(orig_pixels, stego_pixels)
 
-    # Calculate squared differences
-    squared_diff = (orig_float - stego_float) ** 2
+
+def _mse_from_arrays(orig_pixels: np.ndarray, stego_pixels: np.ndarray) -> float:
+    """Calculate MSE between two already loaded pixel arrays."""
+    # float32 is exact for 8-bit differences and moves half the memory of float64
+    # (arrays that are already float32 are used as-is)
+    orig_float = orig_pixels.astype(np.float32, copy=False)
+    stego_float = stego_pixels.astype(np.float32, copy=False)
+
+    # Calculate squared differences (squared in place, no second temporary)
+    squared_diff = orig_float - stego_float
+    np.square(squared_diff, out=squared_diff)
 
     # Calculate mean (average) of all squared differences
     mse = np.mean(squared_diff)
@@ -103,6 +133,11 @@ def calculate_psnr(original_path: str, stego_path: str, max_pixel_value: int = 2
     # Calculate MSE first
     mse = calculate_mse(original_path, stego_path)
 
+    return _psnr_from_mse(mse, max_pixel_value)
+
+
+def _psnr_from_mse(mse: float, max_pixel_value: int = 255) -> float:
+    """Calculate PSNR from an already computed MSE."""
     # Handle perfect match (MSE = 0)
     if mse == 0:
         return float('inf')  # Infinite PSNR (perfect quality)
@@ -151,22 +186,79 @@ def calculate_ssim(original_path: str, stego_path: str) -> float:
     orig_pixels, _ = load_image_for_metrics(original_path)
     stego_pixels, _ = load_image_for_metrics(stego_path)
 
-    # Try to use scikit-image's SSIM (most accurate)
-    try:
-        from skimage.metrics import structural_similarity as ssim
-        # Calculate SSIM for multichannel (RGB) images
-        ssim_value = ssim(orig_pixels, stego_pixels,
-                         channel_axis=2,  # RGB channels
-                         data_range=255)  # 8-bit images
-        return float(ssim_value)
+    return _ssim_from_arrays(orig_pixels, stego_pixels)
 
-    except ImportError:
+
+def _ssim_channel(orig: np.ndarray, stego: np.ndarray) -> float:
+    """
+    Calculate the mean SSIM of one float32 image channel.
+
+    Gives the same value as scikit-image's structural_similarity, but the
+    five local statistics take four filter passes: SSIM only needs the sum
+    var(x) + var(y), so x² and y² are filtered together.
+    """
+    cov_norm = SSIM_WIN_SIZE ** 2 / (SSIM_WIN_SIZE ** 2 - 1)
+
+    # Local means of x, y, x*y and x² + y²
+    mean_orig = uniform_filter(orig, SSIM_WIN_SIZE)
+    mean_stego = uniform_filter(stego, SSIM_WIN_SIZE)
+    mean_cross = uniform_filter(orig * stego, SSIM_WIN_SIZE)
+    squares = orig * orig
+    squares += stego * stego
+    mean_squares = uniform_filter(squares, SSIM_WIN_SIZE)
+
+    # Covariance and the sum of the variances (reusing the buffers in place)
+    mean_product = mean_orig * mean_stego
+    mean_orig *= mean_orig
+    mean_orig += mean_stego * mean_stego
+    covar = cov_norm * (mean_cross - mean_product)
+    var_sum = cov_norm * (mean_squares - mean_orig)
+
+    ssim_map = ((2 * mean_product + SSIM_C1) * (2 * covar + SSIM_C2)) / \
+               ((mean_orig + SSIM_C1) * (var_sum + SSIM_C2))
+
+    # Ignore the border, where the window runs off the image
+    pad = (SSIM_WIN_SIZE - 1) // 2
+    return float(ssim_map[pad:-pad, pad:-pad].mean(dtype=np.float64))
+
+
+def _ssim_from_arrays(orig_pixels: np.ndarray, stego_pixels: np.ndarray,
+                     channel_axis: int = 2) -> float:
+    """Calculate SSIM between two already loaded pixel arrays."""
+    # Use the windowed SSIM if SciPy is available (most accurate)
+    if uniform_filter is not None:
+        if orig_pixels.shape != stego_pixels.shape:
+            raise ValueError("Input images must have the same dimensions.")
+
+        # Contiguous float32 planes, one per channel: the filters run
+        # fastest on those (arrays already in that layout are not copied)
+        orig_planes = np.ascontiguousarray(np.moveaxis(orig_pixels, channel_axis, 0),
+                                           dtype=np.float32)
+        stego_planes = np.ascontiguousarray(np.moveaxis(stego_pixels, channel_axis, 0),
+                                            dtype=np.float32)
+        if min(orig_planes.shape[1:]) < SSIM_WIN_SIZE:
+            raise ValueError(f"Images must be at least {SSIM_WIN_SIZE}x{SSIM_WIN_SIZE} "
+                             "pixels for SSIM")
+
+        # Multichannel SSIM is the mean of the per-channel values, so on
+        # multi-core hosts compute the channels in parallel
+        def channel_ssim(c):
+            return _ssim_channel(orig_planes[c], stego_planes[c])
+
+        channels = range(orig_planes.shape[0])
+        if _metrics_pool is not None:
+            channel_values = _metrics_pool.map(channel_ssim, channels)
+        else:
+            channel_values = map(channel_ssim, channels)
+        return float(np.mean(list(channel_values)))
+
+    else:
         # Fallback: Simple correlation-based similarity
         # This is a simplified version but still useful
 
         # Convert to float and normalize
-        orig_norm = orig_pixels.astype(float) / 255.0
-        stego_norm = stego_pixels.astype(float) / 255.0
+        orig_norm = orig_pixels.astype(np.float32) / 255.0
+        stego_norm = stego_pixels.astype(np.float32) / 255.0
 
         # Calculate means
         mean_orig = np.mean(orig_norm)
@@ -224,10 +316,53 @@ def calculate_metrics_summary(original_path: str, stego_path: str) -> dict:
         >>> print(f"PSNR: {metrics['psnr']:.2f} dB")
         >>> print(f"SSIM: {metrics['ssim']:.4f}")
     """
-    # Calculate all three metrics
-    mse = calculate_mse(original_path, stego_path)
-    psnr = calculate_psnr(original_path, stego_path)
-    ssim = calculate_ssim(original_path, stego_path)
+    # Load each image once and reuse it for all three metrics
+    orig_pixels, _ = load_image_for_metrics(original_path)
+    stego_pixels, _ = load_image_for_metrics(stego_path)
+
+    return _metrics_summary_from_arrays(orig_pixels, stego_pixels)
+
+
+def calculate_metrics_summary_bytes(original_data: bytes, stego_data: bytes) -> dict:
+    """
+    Calculate all quality metrics for two images held in memory.
+
+    Same as calculate_metrics_summary(), but takes the encoded image file
+    contents instead of paths, so no temporary files are needed.
+
+    Args:
+        original_data: Encoded original cover image
+        stego_data: Encoded stego image
+
+    Returns:
+        Same dictionary as calculate_metrics_summary()
+
+    Example:
+        >>> metrics = calculate_metrics_summary_bytes(cover_bytes, stego_bytes)
+        >>> print(f"Quality: {metrics['quality_assessment']}")
+    """
+    # Decode both images at once on multi-core hosts
+    if _metrics_pool is not None:
+        stego_future = _metrics_pool.submit(load_image_for_metrics, io.BytesIO(stego_data))
+        orig_pixels, _ = load_image_for_metrics(io.BytesIO(original_data))
+        stego_pixels, _ = stego_future.result()
+    else:
+        orig_pixels, _ = load_image_for_metrics(io.BytesIO(original_data))
+        stego_pixels, _ = load_image_for_metrics(io.BytesIO(stego_data))
+
+    return _metrics_summary_from_arrays(orig_pixels, stego_pixels)
+
+
+def _metrics_summary_from_arrays(orig_pixels: np.ndarray, stego_pixels: np.ndarray) -> dict:
+    """Build the metrics summary from two already loaded pixel arrays."""
+    # Convert to float32 channel planes once, for both MSE and SSIM
+    orig_planes = np.ascontiguousarray(np.moveaxis(orig_pixels, 2, 0), dtype=np.float32)
+    stego_planes = np.ascontiguousarray(np.moveaxis(stego_pixels, 2, 0), dtype=np.float32)
+
+    # Calculate all three metrics (PSNR is derived from MSE, not recomputed)
+    mse = _mse_from_arrays(orig_planes, stego_planes)
+    psnr = _psnr_from_mse(mse)
+    ssim = _ssim_from_arrays(orig_planes, stego_planes, channel_axis=0)
 
     # Interpret MSE
     if mse == 0:
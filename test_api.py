@@ -72,6 +72,68 @@ def test_text_steganography():
         return False
 
 
+def test_image_steganography():
+    """Test LSB image encode/decode round trip for every bits_per_pixel."""
+    print("\nTesting image steganography...")
+
+    import os
+    import tempfile
+    import image_stego
+
+    secret = "Secret image message!"
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cover_path = os.path.join(tmp_dir, 'cover.png')
+        stego_path = os.path.join(tmp_dir, 'stego.png')
+        image_stego.create_test_image(64, 48, cover_path)
+
+        for bits_per_pixel in [1, 2, 3]:
+            image_stego.encode_lsb(cover_path, secret, stego_path,
+                                   bits_per_pixel=bits_per_pixel)
+            decoded = image_stego.decode_lsb(stego_path, bits_per_pixel=bits_per_pixel)
+
+            if decoded != secret:
+                print(f"✗ Decoding failed with {bits_per_pixel} bit(s). "
+                      f"Expected '{secret}', got '{decoded}'")
+                return False
+
+        # In-memory variants used by the API must match the file-based ones
+        with open(cover_path, 'rb') as f:
+            cover_bytes = f.read()
+        with open(stego_path, 'rb') as f:
+            stego_bytes = f.read()
+
+        stego_from_bytes, _ = image_stego.encode_lsb_bytes(cover_bytes, secret,
+                                                           bits_per_pixel=3)
+        if stego_from_bytes != stego_bytes:
+            print("✗ encode_lsb_bytes output differs from encode_lsb")
+            return False
+
+        decoded = image_stego.decode_lsb_bytes(stego_from_bytes, bits_per_pixel=3)
+        if decoded != secret:
+            print(f"✗ decode_lsb_bytes failed. Expected '{secret}', got '{decoded}'")
+            return False
+
+        # Integral floats (as JSON may send them) work like ints
+        float_bytes, _ = image_stego.encode_lsb_bytes(cover_bytes, secret,
+                                                      bits_per_pixel=2.0, channel=1.0)
+        decoded = image_stego.decode_lsb_bytes(float_bytes, bits_per_pixel=2.0, channel=1.0)
+        if decoded != secret:
+            print(f"✗ Float parameters failed. Expected '{secret}', got '{decoded}'")
+            return False
+
+        # Lossless WebP output must keep every LSB
+        webp_bytes, _ = image_stego.encode_lsb_bytes(cover_bytes, secret,
+                                                     output_format='WEBP')
+        decoded = image_stego.decode_lsb_bytes(webp_bytes)
+        if decoded != secret:
+            print(f"✗ WebP round trip failed. Expected '{secret}', got '{decoded}'")
+            return False
+
+    print(f"✓ Decoded message correctly with 1, 2 and 3 bits per pixel: '{secret}'")
+    return True
+
+
 def test_security():
     """Test encryption/decryption."""
     print("\nTesting security module...")
@@ -147,6 +209,162 @@ def test_api_structure():
         return True
 
 
+def test_multipart_upload():
+    """Test image upload as multipart/form-data instead of base64 JSON."""
+    print("\nTesting multipart uploads...")
+
+    try:
+        import app
+    except ImportError:
+        print("⚠️  Flask not installed - skipping multipart tests")
+        return True
+
+    import io
+    import json
+    import image_stego
+
+    cover = io.BytesIO()
+    image_stego.create_test_image(64, 48, cover)
+    client = app.app.test_client()
+    secret = "Uploaded secret"
+
+    # Encode from an uploaded file, get the raw stego image back
+    response = client.post('/api/encode?format=binary', data={
+        'meta': json.dumps({'algorithm': 'lsb', 'secret_message': secret,
+                            'password': 'pw'}),
+        'cover_image': (io.BytesIO(cover.getvalue()), 'cover.png')
+    })
+    if response.status_code != 200 or response.mimetype != 'image/png':
+        print(f"✗ Multipart encode failed: {response.status_code} {response.data[:80]}")
+        return False
+
+    # Decode by uploading the stego image
+    response = client.post('/api/decode', data={
+        'meta': json.dumps({'algorithm': 'lsb', 'password': 'pw'}),
+        'stego_image': (io.BytesIO(response.data), 'stego.png')
+    })
+    body = response.get_json()
+    if response.status_code != 200 or body.get('secret_message') != secret:
+        print(f"✗ Multipart decode failed: {response.status_code} {body}")
+        return False
+    print(f"✓ Multipart encode → decode round trip: '{secret}'")
+
+    # Without ?format=binary the Accept header picks JSON or the image,
+    # so both answers must carry Vary: Accept
+    encode_meta = json.dumps({'algorithm': 'lsb', 'secret_message': secret})
+    for accept, mimetype in [('image/png', 'image/png'),
+                             ('application/json', 'application/json')]:
+        response = client.post('/api/encode', headers={'Accept': accept}, data={
+            'meta': encode_meta,
+            'cover_image': (io.BytesIO(cover.getvalue()), 'cover.png')
+        })
+        if response.mimetype != mimetype or 'Accept' not in response.vary:
+            print(f"✗ Accept: {accept} gave {response.mimetype}, "
+                  f"Vary: {response.headers.get('Vary')}")
+            return False
+    print("✓ Accept-negotiated encode responses send Vary: Accept")
+
+    # A missing or malformed 'meta' field, and non-image uploads, are 400s
+    def upload(data=cover.getvalue(), filename='cover.png'):
+        return (io.BytesIO(data), filename)
+
+    lsb_meta = json.dumps({'algorithm': 'lsb'})
+    bad_requests = [
+        ("missing meta", {'stego_image': upload()}),
+        ("invalid meta JSON", {'meta': '{not json', 'stego_image': upload()}),
+        ("non-object meta", {'meta': '[1, 2]', 'stego_image': upload()}),
+        ("non-image upload", {'meta': lsb_meta,
+                              'stego_image': upload(b'GIF89a' + bytes(32), 'a.gif')}),
+    ]
+    for name, fields in bad_requests:
+        response = client.post('/api/decode', data=fields)
+        body = response.get_json()
+        if response.status_code != 400 or body.get('success') is not False:
+            print(f"✗ {name}: expected 400, got {response.status_code} {body}")
+            return False
+    print("✓ Missing/invalid meta and non-image uploads rejected with 400")
+
+    return True
+
+
+def test_error_responses():
+    """Test that API errors come back as JSON with the right status codes."""
+    print("\nTesting API error responses...")
+
+    try:
+        import app
+    except ImportError:
+        print("⚠️  Flask not installed - skipping error response tests")
+        return True
+
+    import base64
+
+    client = app.app.test_client()
+
+    # A PNG signature followed by garbage passes validation, then fails in PIL
+    broken_png = base64.b64encode(b'\x89PNG\r\n\x1a\n' + bytes(64)).decode('ascii')
+
+    cases = [
+        ("malformed JSON", 400, None,
+         lambda: client.post('/api/encode', data='{"algorithm": ',
+                             content_type='application/json')),
+        ("non-object JSON body", 400, None,
+         lambda: client.post('/api/decode', json=[1, 2, 3])),
+        ("wrong method", 405, None,
+         lambda: client.get('/api/encode')),
+        ("non-JSON content type", 415, None,
+         lambda: client.post('/api/decode', data='hello', content_type='text/plain')),
+        ("processing failure", 500, "Encoding failed:",
+         lambda: client.post('/api/encode', json={'algorithm': 'lsb',
+                                                  'cover_image': broken_png,
+                                                  'secret_message': 'x'})),
+    ]
+
+    for name, status_code, prefix, send in cases:
+        response = send()
+        body = response.get_json(silent=True) or {}
+        error = body.get('error')
+        if (response.status_code != status_code or body.get('success') is not False
+                or not isinstance(error, str)):
+            print(f"✗ {name}: expected JSON {status_code}, got "
+                  f"{response.status_code} {response.data[:80]}")
+            return False
+        if prefix and not error.startswith(prefix):
+            print(f"✗ {name}: error should start with '{prefix}', got '{error}'")
+            return False
+        print(f"✓ {name} → {status_code} {{'success': false, 'error': ...}}")
+
+    # Oversized base64 images get a JSON 413 before they are decoded. A body
+    # under MAX_CONTENT_LENGTH cannot decode past 16MB, so lower the limit
+    from unittest import mock
+    with mock.patch.object(app, 'MAX_IMAGE_SIZE_BYTES', 1024):
+        response = client.post('/api/decode', json={'algorithm': 'lsb',
+                                                     'stego_image': 'A' * 4096})
+    body = response.get_json(silent=True) or {}
+    if response.status_code != 413 or body.get('success') is not False:
+        print(f"✗ oversized base64 image: expected JSON 413, got "
+              f"{response.status_code} {response.data[:80]}")
+        return False
+    print("✓ oversized base64 image → 413 {'success': false, 'error': ...}")
+
+    # HTTP errors keep their own headers, e.g. Allow on 405
+    if 'POST' not in client.get('/api/encode').headers.get('Allow', ''):
+        print("✗ 405 response lost its Allow header")
+        return False
+
+    # Pre-serialized bodies must match jsonify() byte for byte
+    with app.app.app_context():
+        cached = app.error_response("'stego_text' is required")[0].get_data()
+        fresh = app.jsonify({'error': "'stego_text' is required",
+                             'success': False}).get_data()
+    if cached != fresh:
+        print(f"✗ cached error body {cached!r} differs from jsonify() {fresh!r}")
+        return False
+    print("✓ cached error bodies match jsonify() output")
+
+    return True
+
+
 def main():
     """Run all tests."""
     print("=" * 70)
@@ -156,8 +374,11 @@ def main():
     tests = [
         ("Module Imports", test_module_imports),
         ("Text Steganography", test_text_steganography),
+        ("Image Steganography", test_image_steganography),
         ("Security", test_security),
         ("API Structure", test_api_structure),
+        ("Multipart Uploads", test_multipart_upload),
+        ("Error Responses", test_error_responses),
     ]
 
     results = []
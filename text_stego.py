@@ -4,8 +4,14 @@ Zero-Width Character (ZWC) Text Steganography
 This module implements text steganography using invisible Unicode zero-width characters.
 Secret messages are encoded as binary and then mapped to zero-width characters that are
 hidden within normal visible text.
+
+The bit/character conversions work on NumPy arrays of code points, so a whole
+message is mapped in a few C-level array operations instead of a Python loop
+per character.
 """
 
+import numpy as np
+
 
 # Zero-width Unicode characters used for steganography
 # Basic 1-bit encoding
@@ -18,6 +24,36 @@ ZWC_01 = '\u200C'  # Zero Width Non-Joiner
 ZWC_10 = '\u200D'  # Zero Width Joiner
 ZWC_11 = '\uFEFF'  # Zero Width No-Break Space
 
+# Code point lookup tables, indexed by the value they encode.
+# Both are in ascending code point order, so np.searchsorted on a table
+# maps a ZWC code point straight back to its value.
+ZWC_1BIT_TABLE = np.array([ord(ZWC_0), ord(ZWC_1)], dtype=np.uint32)
+ZWC_2BIT_TABLE = np.array([ord(ZWC_00), ord(ZWC_01), ord(ZWC_10), ord(ZWC_11)],
+                          dtype=np.uint32)
+
+
+def _text_to_codepoints(text: str) -> np.ndarray:
+    """Convert a string to a uint32 array of Unicode code points."""
+    return np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+
+
+def _codepoints_to_text(codepoints: np.ndarray) -> str:
+    """Convert a uint32 array of Unicode code points back to a string."""
+    return codepoints.astype('<u4').tobytes().decode('utf-32-le', 'surrogatepass')
+
+
+def _binary_to_bit_array(binary: str) -> np.ndarray:
+    """
+    Convert a string of '0'/'1' characters to a uint8 array of bit values.
+
+    Any character other than '0' or '1' ends up as a value greater than 1,
+    so callers can detect invalid input with a single comparison.
+    """
+    if binary.isascii():
+        # uint8 subtraction wraps around, so characters below '0' become > 1
+        return np.frombuffer(binary.encode('ascii'), dtype=np.uint8) - ord('0')
+    return np.minimum(_text_to_codepoints(binary) - ord('0'), 2).astype(np.uint8)
+
 
 def text_to_binary(text: str) -> str:
     """
@@ -33,17 +69,22 @@ def text_to_binary(text: str) -> str:
         >>> text_to_binary("Hi")
         '0100100001101001'
     """
-    # Convert each character to its UTF-8 byte representation, then to binary
-    binary_result = []
-
-    for char in text:
-        # Get the Unicode code point of the character
-        code_point = ord(char)
-        # Convert to binary (without '0b' prefix) and pad to 8 bits
-        binary = bin(code_point)[2:].zfill(8)
-        binary_result.append(binary)
-
-    return ''.join(binary_result)
+    try:
+        # Characters up to U+00FF are exactly 8 bits each
+        text_bytes = text.encode('latin-1')
+    except UnicodeEncodeError:
+        # Wider characters need more than 8 bits, convert them one by one
+        binary_result = []
+        for char in text:
+            # Get the Unicode code point of the character
+            code_point = ord(char)
+            # Convert to binary (without '0b' prefix) and pad to 8 bits
+            binary = bin(code_point)[2:].zfill(8)
+            binary_result.append(binary)
+        return ''.join(binary_result)
+
+    bits = np.unpackbits(np.frombuffer(text_bytes, dtype=np.uint8))
+    return (bits + ord('0')).tobytes().decode('ascii')
 
 
 def binary_to_text(binary: str) -> str:
@@ -60,16 +101,13 @@ def binary_to_text(binary: str) -> str:
         >>> binary_to_text("0100100001101001")
         'Hi'
     """
-    # Split binary string into 8-bit chunks
-    chars = []
-    for i in range(0, len(binary), 8):
-        byte = binary[i:i+8]
-        if len(byte) == 8:  # Only process complete bytes
-            # Convert binary to integer, then to character
-            char = chr(int(byte, 2))
-            chars.append(char)
+    # Only process complete 8-bit chunks
+    bits = _binary_to_bit_array(binary[:len(binary) - len(binary) % 8])
+    if bits.size and bits.max() > 1:
+        raise ValueError("Binary string may only contain '0' and '1'")
 
-    return ''.join(chars)
+    # Pack each 8-bit chunk into one byte, which is the character's code point
+    return np.packbits(bits).tobytes().decode('latin-1')
 
 
 def binary_to_zwc(binary: str, encoding_bits: int = 1) -> str:
@@ -89,37 +127,28 @@ def binary_to_zwc(binary: str, encoding_bits: int = 1) -> str:
         >>> zwc = binary_to_zwc("01")
         >>> # Returns invisible characters representing the binary
     """
+    bits = _binary_to_bit_array(binary)
+
     if encoding_bits == 1:
         # Simple 1-bit encoding: 0 → ZWC_0, 1 → ZWC_1
-        zwc_chars = []
-        for bit in binary:
-            if bit == '0':
-                zwc_chars.append(ZWC_0)
-            elif bit == '1':
-                zwc_chars.append(ZWC_1)
-            else:
-                raise ValueError(f"Invalid binary character: {bit}")
-        return ''.join(zwc_chars)
+        invalid = bits > 1
+        if invalid.any():
+            raise ValueError(f"Invalid binary character: {binary[int(np.argmax(invalid))]}")
+        return _codepoints_to_text(ZWC_1BIT_TABLE[bits])
 
     elif encoding_bits == 2:
         # 2-bit encoding: 00, 01, 10, 11 → four different ZWC characters
         # Pad binary string to even length if needed
-        if len(binary) % 2 != 0:
-            binary += '0'
-
-        zwc_chars = []
-        for i in range(0, len(binary), 2):
-            two_bits = binary[i:i+2]
-            if two_bits == '00':
-                zwc_chars.append(ZWC_00)
-            elif two_bits == '01':
-                zwc_chars.append(ZWC_01)
-            elif two_bits == '10':
-                zwc_chars.append(ZWC_10)
-            elif two_bits == '11':
-                zwc_chars.append(ZWC_11)
-
-        return ''.join(zwc_chars)
+        if bits.size % 2 != 0:
+            bits = np.append(bits, np.uint8(0))
+
+        high_bits = bits[0::2]
+        low_bits = bits[1::2]
+
+        # Pairs containing anything other than 0/1 are skipped
+        valid = (high_bits <= 1) & (low_bits <= 1)
+        pair_values = (high_bits[valid] << 1) | low_bits[valid]
+        return _codepoints_to_text(ZWC_2BIT_TABLE[pair_values])
 
     else:
         raise ValueError("encoding_bits must be 1 or 2")
@@ -136,29 +165,24 @@ def zwc_to_binary(zwc_text: str, encoding_bits: int = 1) -> str:
     Returns:
         Binary string (0s and 1s)
     """
-    binary_result = []
-
     if encoding_bits == 1:
-        for char in zwc_text:
-            if char == ZWC_0:
-                binary_result.append('0')
-            elif char == ZWC_1:
-                binary_result.append('1')
-            # Ignore other characters (visible text)
-
+        table = ZWC_1BIT_TABLE
     elif encoding_bits == 2:
-        for char in zwc_text:
-            if char == ZWC_00:
-                binary_result.append('00')
-            elif char == ZWC_01:
-                binary_result.append('01')
-            elif char == ZWC_10:
-                binary_result.append('10')
-            elif char == ZWC_11:
-                binary_result.append('11')
-            # Ignore other characters
+        table = ZWC_2BIT_TABLE
+    else:
+        return ''
 
-    return ''.join(binary_result)
+    # Keep only our ZWC characters (ignore visible text), then look up
+    # the value each one encodes
+    codepoints = _text_to_codepoints(zwc_text)
+    codepoints = codepoints[np.isin(codepoints, table)]
+    values = np.searchsorted(table, codepoints).astype(np.uint8)
+
+    if encoding_bits == 2:
+        # Split each 2-bit value into its high and low bit
+        values = np.stack([values >> 1, values & 1], axis=1).reshape(-1)
+
+    return (values + ord('0')).tobytes().decode('ascii')
 
 
 def encode_message(cover_text: str, secret_message: str, encoding_bits: int = 1,
@@ -227,21 +251,20 @@ def encode_message(cover_text: str, secret_message: str, encoding_bits: int = 1,
             stego_text = zwc_string
         else:
             interval = max(len(cover_text) // len(zwc_string), 1) if zwc_string else 0
-            result = []
-            zwc_index = 0
 
-            for i, char in enumerate(cover_text):
-                result.append(char)
-                # Insert ZWC at regular intervals
-                if interval > 0 and (i + 1) % interval == 0 and zwc_index < len(zwc_string):
-                    result.append(zwc_string[zwc_index])
-                    zwc_index += 1
+            # One ZWC goes after every 'interval' visible characters,
+            # any that don't fit are appended at the end
+            inline_count = min(len(zwc_string), len(cover_text) // interval) if interval else 0
+            is_zwc = np.zeros(len(cover_text) + len(zwc_string), dtype=bool)
+            is_zwc[np.arange(1, inline_count + 1) * (interval + 1) - 1] = True
+            is_zwc[len(cover_text) + inline_count:] = True
 
-            # Append any remaining ZWC
-            if zwc_index < len(zwc_string):
-                result.append(zwc_string[zwc_index:])
+            # Interleave the two code point arrays in one pass
+            result = np.empty(is_zwc.size, dtype=np.uint32)
+            result[is_zwc] = _text_to_codepoints(zwc_string)
+            result[~is_zwc] = _text_to_codepoints(cover_text)
 
-            stego_text = ''.join(result)
+            stego_text = _codepoints_to_text(result)
 
     else:
         raise ValueError(f"Unknown insertion_method: {insertion_method}")